@@ -21,12 +21,18 @@ Task Format:
 }
 """
 
+import csv
+import ctypes
+import ctypes.wintypes
 import json
 import os
+import signal
 import subprocess
+import threading
 import time
+from collections import deque
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Deque, Dict, Any, IO, List, Optional, Tuple
 import sys
 
 # Add BOSS base path to Python path
@@ -35,17 +41,52 @@ sys.path.insert(0, str(BOSS_BASE))
 
 from workers.base.base_worker import BaseWorker
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# ToolHelp snapshot API (kernel32), used to enumerate processes without psutil
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", ctypes.wintypes.DWORD),
+        ("cntUsage", ctypes.wintypes.DWORD),
+        ("th32ProcessID", ctypes.wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", ctypes.wintypes.DWORD),
+        ("cntThreads", ctypes.wintypes.DWORD),
+        ("th32ParentProcessID", ctypes.wintypes.DWORD),
+        ("pcPriClassBase", ctypes.wintypes.LONG),
+        ("dwFlags", ctypes.wintypes.DWORD),
+        ("szExeFile", ctypes.wintypes.WCHAR * 260),
+    ]
+
 
 class AutonomousCodingWorker(BaseWorker):
     """
     BOSS Worker for ACH autonomous coding integration
     """
 
+    # Process names left behind by ACH sessions (Playwright MCP + browsers)
+    MCP_PROCESS_KEYWORDS = ('playwright', 'mcp-server', 'chrome')
+
+    # Build output that means the build has already failed (tsc / webpack)
+    BUILD_ERROR_MARKERS = ('error TS', 'ERROR in ')
+
     def __init__(self):
         super().__init__()
         self.worker_type = "autonomous_coding"
         self.ach_location = r"C:\Jarvis\AI Workspace\BOSS Exchange\autonomous-coding"
         self.ach_script = "autonomous_agent_demo.py"
+        self.debug = bool(os.environ.get("BOSS_DEBUG"))
+
+        # Fixed part of every ACH command, built once rather than per session
+        self._ach_script_path = os.path.join(self.ach_location, self.ach_script)
+        self._cmd_prefix = ('python', self._ach_script_path)
 
     def execute(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -82,13 +123,18 @@ class AutonomousCodingWorker(BaseWorker):
 
         # Session tracking
         session_count = 0
+        consecutive_failures = 0
+        all_tests_passed = False
         sessions_completed = []
         sessions_failed = []
 
         start_time = time.time()
 
         try:
-            # Main session loop
+            # Main session loop. A failed session is not re-run; the next
+            # session (fresh id) carries on from the feature list, and every
+            # session counts towards max_sessions, so repeated failures can't
+            # loop forever.
             while session_count < max_sessions:
                 session_id = f"session-{session_count}"
                 print(f"\n🚀 [Session {session_count + 1}/{max_sessions}] Starting ACH session")
@@ -102,34 +148,37 @@ class AutonomousCodingWorker(BaseWorker):
                 )
 
                 if session_result['success']:
+                    consecutive_failures = 0
                     sessions_completed.append(session_id)
                     print(f"✅ [Session {session_count + 1}] Completed successfully")
 
                     # Check if all tests passed (completion criteria)
                     if session_result.get('all_tests_passed', False):
                         print(f"\n🎉 [Autonomous Coding] All tests passed! Workflow complete.")
+                        all_tests_passed = True
+                        session_count += 1
                         break
                 else:
+                    consecutive_failures += 1
                     sessions_failed.append(session_id)
                     print(f"❌ [Session {session_count + 1}] Failed: {session_result.get('error', 'Unknown error')}")
-
-                    # Retry logic (max 2 retries)
-                    retry_count = session_result.get('retry_count', 0)
-                    if retry_count < 2:
-                        print(f"🔄 [Session {session_count + 1}] Retrying ({retry_count + 1}/2)...")
-                        continue
-                    else:
-                        print(f"⚠️  [Session {session_count + 1}] Max retries reached, continuing...")
+                    if consecutive_failures > 1:
+                        print(f"⚠️  [Session {session_count + 1}] {consecutive_failures} sessions failed in a row")
 
                 session_count += 1
 
                 # Cleanup MCP processes between sessions
-                if session_count % 1 == 0:  # Every session
-                    print(f"🧹 [Cleanup] Cleaning up MCP processes")
-                    self._cleanup_mcp_processes()
+                print(f"🧹 [Cleanup] Cleaning up MCP processes")
 
                 # Checkpoint validation every N sessions
                 if session_count % checkpoint_interval == 0 and session_count < max_sessions:
+                    # Overlap the cleanup with the checkpoint build (which
+                    # starts no MCP processes); it is joined before the next
+                    # session starts, since it would kill that session's MCP
+                    # servers. Without a checkpoint a thread only adds overhead.
+                    cleanup = threading.Thread(target=self._cleanup_mcp_processes, daemon=True)
+                    cleanup.start()
+
                     print(f"\n🔍 [Checkpoint {session_count // checkpoint_interval}] Running validation")
                     validation_result = self._run_checkpoint_validation(task, session_count)
 
@@ -137,6 +186,10 @@ class AutonomousCodingWorker(BaseWorker):
                         print(f"⚠️  [Checkpoint] Validation warnings: {validation_result.get('warnings', [])}")
                         # Continue anyway (warnings, not errors)
 
+                    cleanup.join()
+                else:
+                    self._cleanup_mcp_processes()
+
             # Final metrics
             total_duration = time.time() - start_time
             success_rate = len(sessions_completed) / session_count if session_count > 0 else 0
@@ -155,7 +208,7 @@ class AutonomousCodingWorker(BaseWorker):
                 "sessions_failed": len(sessions_failed),
                 "success_rate": success_rate,
                 "total_duration": total_duration,
-                "all_tests_passed": session_count < max_sessions,  # Completed early if true
+                "all_tests_passed": all_tests_passed,
             }
 
         except Exception as e:
@@ -193,11 +246,8 @@ class AutonomousCodingWorker(BaseWorker):
         print(f"💻 [ACH Session] Spawning ACH subprocess")
 
         # Construct ACH command
-        ach_script_path = os.path.join(self.ach_location, self.ach_script)
-
         cmd = [
-            'python',
-            ach_script_path,
+            *self._cmd_prefix,
             '--session-id', session_id,
             '--project-root', project_root,
             '--feature-list', feature_list_path,
@@ -205,28 +255,64 @@ class AutonomousCodingWorker(BaseWorker):
             '--autonomous',
         ]
 
-        print(f"   Command: {' '.join(cmd)}")
+        if self.debug:
+            print(f"   Command: {' '.join(cmd)}")
+
+        stdout_tail: Deque[str] = deque(maxlen=64)
+        stderr_tail: Deque[str] = deque(maxlen=64)
 
         try:
-            # Spawn ACH subprocess with proper encoding for Windows
-            result = subprocess.run(
+            # Spawn ACH subprocess with proper encoding for Windows.
+            # Output is streamed rather than captured: only the last lines are
+            # kept, so a chatty 10 minute session stays at constant memory.
+            process = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
                 text=True,
                 encoding='utf-8',
+                errors='replace',
+                bufsize=1,
                 cwd=self.ach_location,
-                timeout=600,  # 10 minute timeout per session
             )
 
+            readers = [
+                threading.Thread(
+                    target=self._stream_to_tail,
+                    args=(process.stdout, stdout_tail, "   [ACH] "),
+                    daemon=True,
+                ),
+                threading.Thread(
+                    target=self._stream_to_tail,
+                    args=(process.stderr, stderr_tail, "   [ACH stderr] "),
+                    daemon=True,
+                ),
+            ]
+            for reader in readers:
+                reader.start()
+
+            try:
+                returncode = process.wait(timeout=600)  # 10 minute timeout per session
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                # Grandchildren (browsers, MCP servers) can inherit the pipes
+                # and keep them open, so wait for EOF at most 5s in total. A
+                # reader still running after that is left behind and can keep
+                # printing [ACH] lines into later sessions' output.
+                deadline = time.monotonic() + 5
+                for reader in readers:
+                    reader.join(timeout=max(0, deadline - time.monotonic()))
+
             # Check result
-            if result.returncode == 0:
+            if returncode == 0:
                 print(f"✅ [ACH Session] Completed successfully")
 
                 # Parse output for metrics (if available)
                 # ACH should output JSON on last line for metrics
                 try:
-                    output_lines = result.stdout.strip().split('\n')
-                    last_line = output_lines[-1] if output_lines else '{}'
+                    last_line = stdout_tail[-1] if stdout_tail else '{}'
                     metrics = json.loads(last_line)
                 except:
                     metrics = {}
@@ -238,14 +324,15 @@ class AutonomousCodingWorker(BaseWorker):
                     "all_tests_passed": metrics.get('all_tests_passed', False),
                 }
             else:
-                print(f"❌ [ACH Session] Failed with return code {result.returncode}")
-                print(f"   stderr: {result.stderr[:500]}")  # First 500 chars
+                stderr_text = "\n".join(stderr_tail)[-500:]  # Last 500 chars
+                print(f"❌ [ACH Session] Failed with return code {returncode}")
+                print(f"   stderr: {stderr_text}")
 
                 return {
                     "success": False,
                     "session_id": session_id,
-                    "error": result.stderr[:500],
-                    "return_code": result.returncode,
+                    "error": stderr_text,
+                    "return_code": returncode,
                 }
 
         except subprocess.TimeoutExpired:
@@ -264,56 +351,157 @@ class AutonomousCodingWorker(BaseWorker):
                 "error": str(e),
             }
 
+    @staticmethod
+    def _stream_to_tail(stream: IO[str], tail: Deque[str], prefix: str) -> None:
+        """
+        Forward a subprocess stream line by line, keeping only its last lines
+
+        Args:
+            stream: Text stream to read until EOF
+            tail: Bounded deque receiving the non-blank lines
+            prefix: Prefix for lines echoed to the worker log
+        """
+        with stream:
+            for line in stream:
+                line = line.rstrip()
+                if line:
+                    tail.append(line)
+                    print(f"{prefix}{line}", flush=True)
+
     def _cleanup_mcp_processes(self) -> None:
         """
         Cleanup MCP processes (Windows-compatible)
 
-        Uses tasklist to find MCP processes, then taskkill with specific PIDs
+        Uses psutil when installed: processes are enumerated and terminated
+        in-process, without spawning tasklist/taskkill. Otherwise processes
+        are listed via a ToolHelp snapshot, then a single taskkill is run
+        with the specific PIDs.
         NEVER uses taskkill //F //IM (that kills ALL processes)
         """
         print(f"🧹 [MCP Cleanup] Checking for MCP processes")
 
-        try:
-            # Find MCP processes using tasklist
-            result = subprocess.run(
-                ['tasklist'],
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-            )
+        if sys.platform != 'win32':
+            # psutil would match the user's own browsers on other platforms
+            print(f"✅ [MCP Cleanup] Skipped (Windows only)")
+            return
 
-            if result.returncode != 0:
-                print(f"⚠️  [MCP Cleanup] Could not list processes")
-                return
+        if psutil is not None:
+            self._cleanup_mcp_processes_psutil()
+            return
 
+        try:
             # Filter for MCP-related processes
-            mcp_pids = []
-            for line in result.stdout.split('\n'):
-                # Look for playwright, mcp, or related processes
-                if any(keyword in line.lower() for keyword in ['playwright', 'mcp-server', 'chrome']):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        try:
-                            pid = int(parts[1])  # PID is typically second column
-                            mcp_pids.append(pid)
-                        except ValueError:
-                            continue
+            own_pid = os.getpid()
+            mcp_pids = [
+                pid for pid, name in self._list_processes()
+                if pid != own_pid
+                and any(keyword in name.lower() for keyword in self.MCP_PROCESS_KEYWORDS)
+            ]
 
             if not mcp_pids:
                 print(f"✅ [MCP Cleanup] No MCP processes found")
                 return
 
-            # Kill specific PIDs (NOT all processes of a type)
+            # Kill specific PIDs (NOT all processes of a type). taskkill takes
+            # any number of /PID arguments, so one spawn covers all of them;
+            # PIDs that already exited are reported by taskkill and skipped.
             print(f"🗑️  [MCP Cleanup] Found {len(mcp_pids)} MCP processes, cleaning up...")
+            taskkill_cmd = ['taskkill', '/F']
             for pid in mcp_pids:
+                taskkill_cmd += ['/PID', str(pid)]
+
+            try:
+                subprocess.run(
+                    taskkill_cmd,
+                    capture_output=True,
+                    timeout=10,
+                )
+                print(f"   Killed PIDs {', '.join(str(pid) for pid in mcp_pids)}")
+            except subprocess.TimeoutExpired:
+                print(f"⚠️  [MCP Cleanup] taskkill timed out")
+
+            print(f"✅ [MCP Cleanup] Cleanup complete")
+
+        except Exception as e:
+            print(f"⚠️  [MCP Cleanup] Error during cleanup: {e}")
+            # Continue anyway (non-critical)
+
+    @staticmethod
+    def _list_processes() -> List[Tuple[int, str]]:
+        """
+        List running processes as (pid, image name) pairs
+
+        Walks a kernel32 ToolHelp snapshot (the API tasklist itself uses), so
+        no subprocess is spawned and nothing depends on tasklist's
+        locale-specific table layout. Falls back to tasklist's CSV output if
+        the snapshot cannot be taken.
+
+        Returns:
+            List of (pid, image name) tuples
+        """
+        try:
+            kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+            kernel32.CreateToolhelp32Snapshot.restype = ctypes.wintypes.HANDLE
+            kernel32.CreateToolhelp32Snapshot.argtypes = [ctypes.wintypes.DWORD, ctypes.wintypes.DWORD]
+            kernel32.Process32FirstW.argtypes = [ctypes.wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+            kernel32.Process32NextW.argtypes = [ctypes.wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+            kernel32.CloseHandle.argtypes = [ctypes.wintypes.HANDLE]
+
+            snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+            if snapshot in (None, INVALID_HANDLE_VALUE):
+                raise ctypes.WinError(ctypes.get_last_error())
+
+            processes = []
+            try:
+                entry = PROCESSENTRY32W()
+                entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+                found = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+                while found:
+                    processes.append((entry.th32ProcessID, entry.szExeFile))
+                    found = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+            finally:
+                kernel32.CloseHandle(snapshot)
+            return processes
+
+        except (AttributeError, OSError):
+            # CSV columns are stable across locales: "Image Name","PID",...
+            result = subprocess.run(
+                ['tasklist', '/FO', 'CSV', '/NH'],
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                check=True,
+            )
+            return [
+                (int(row[1]), row[0])
+                for row in csv.reader(result.stdout.splitlines())
+                if len(row) >= 2 and row[1].isdigit()
+            ]
+
+    def _cleanup_mcp_processes_psutil(self) -> None:
+        """
+        Cleanup MCP processes through psutil (OpenProcess/TerminateProcess)
+        """
+        try:
+            own_pid = os.getpid()
+            mcp_processes = [
+                proc for proc in psutil.process_iter(['name'])
+                if proc.pid != own_pid
+                and any(keyword in (proc.info['name'] or '').lower() for keyword in self.MCP_PROCESS_KEYWORDS)
+            ]
+
+            if not mcp_processes:
+                print(f"✅ [MCP Cleanup] No MCP processes found")
+                return
+
+            # Kill specific processes (NOT all processes of a type)
+            print(f"🗑️  [MCP Cleanup] Found {len(mcp_processes)} MCP processes, cleaning up...")
+            for proc in mcp_processes:
                 try:
-                    subprocess.run(
-                        ['taskkill', '/F', '/PID', str(pid)],
-                        capture_output=True,
-                        timeout=5,
-                    )
-                    print(f"   Killed PID {pid}")
-                except:
+                    proc.kill()
+                    print(f"   Killed PID {proc.pid}")
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass  # Process may have already exited
 
             print(f"✅ [MCP Cleanup] Cleanup complete")
@@ -340,27 +528,70 @@ class AutonomousCodingWorker(BaseWorker):
         # Run lightweight validation (TypeScript, ESLint, basic tests)
         # This is a placeholder - actual validation would call PAI validators
         try:
-            # Check if project builds
-            build_result = subprocess.run(
+            # Check if project builds. Output is streamed so a failing build
+            # is stopped at its first compiler error instead of running on
+            # until it exits or hits the timeout.
+            process = subprocess.Popen(
                 ['npm', 'run', 'build'],
                 cwd=project_root,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
                 encoding='utf-8',
-                timeout=120,  # 2 minute timeout
+                errors='replace',
+                bufsize=1,
+                # Own process group, so the whole npm -> tsc tree can be stopped
+                start_new_session=(sys.platform != 'win32'),
             )
 
-            if build_result.returncode == 0:
+            # Reading blocks while the build is silent, so the 2 minute
+            # timeout is enforced by a timer rather than by wait()
+            timed_out = threading.Event()
+
+            def kill_on_timeout() -> None:
+                timed_out.set()
+                self._kill_process_tree(process)
+
+            timer = threading.Timer(120, kill_on_timeout)
+            timer.start()
+
+            first_error = None
+            output_tail: Deque[str] = deque(maxlen=20)
+            try:
+                for line in process.stdout:
+                    line = line.rstrip()
+                    if not line:
+                        continue
+                    output_tail.append(line)
+                    if any(marker in line for marker in self.BUILD_ERROR_MARKERS):
+                        first_error = line
+                        self._kill_process_tree(process)
+                        break
+
+                returncode = process.wait(timeout=10)
+            finally:
+                timer.cancel()
+                process.stdout.close()
+
+            if timed_out.is_set():
+                print(f"⚠️  [Checkpoint] Validation error: build timed out after 120 seconds")
+                return {
+                    "passed": False,
+                    "warnings": ["Validation error: build timed out after 120 seconds"],
+                }
+
+            if first_error is None and returncode == 0:
                 print(f"✅ [Checkpoint] Build successful")
                 return {
                     "passed": True,
                     "checks": ["build"],
                 }
             else:
-                print(f"⚠️  [Checkpoint] Build failed: {build_result.stderr[:200]}")
+                failure = first_error or "\n".join(output_tail)[-200:]
+                print(f"⚠️  [Checkpoint] Build failed: {failure[:200]}")
                 return {
                     "passed": False,
-                    "warnings": [f"Build failed: {build_result.stderr[:200]}"],
+                    "warnings": [f"Build failed: {failure[:200]}"],
                 }
 
         except Exception as e:
@@ -370,6 +601,27 @@ class AutonomousCodingWorker(BaseWorker):
                 "warnings": [f"Validation error: {e}"],
             }
 
+    @staticmethod
+    def _kill_process_tree(process: subprocess.Popen) -> None:
+        """
+        Kill a process and everything it spawned (npm runs the real build in
+        a child, which would otherwise keep running and holding files)
+
+        Args:
+            process: Process started with its own session/process group
+        """
+        try:
+            if sys.platform == 'win32':
+                subprocess.run(
+                    ['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                    capture_output=True,
+                    timeout=10,
+                )
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, subprocess.SubprocessError):
+            process.kill()  # Fall back to the direct child only
+
     def validate_task(self, task: Dict[str, Any]) -> bool:
         """
         Validate task configuration
@@ -0,0 +1,389 @@
+"""
+Shared scanning engine for the PAI validators
+Part of PAI (Personal AI Infrastructure)
+
+Walks a source tree once, reads each file once and hands its content to every
+requested validator. dgts-validator.py and zero-tolerance-validator.py
+each describe their part of the work as a Scanner; asking one of them for the
+other's report (--with-zero-tolerance / --with-dgts) runs both in one pass.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import AnyStr, Callable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Directories to skip
+SKIP_DIRS = frozenset(["node_modules", ".git", "__pycache__", "venv", ".venv", "dist", "build", ".next"])
+
+# Generated/minified artifacts and oversized files are not hand-written source
+GENERATED_SUFFIXES = (".min.js", ".bundle.js", ".d.ts")
+MAX_FILE_SIZE = 1_000_000
+
+# Below this many files (or on a single core) worker start-up costs more than
+# scanning serially
+PARALLEL_MIN_FILES = 200
+
+_POOL: Optional[ProcessPoolExecutor] = None
+
+
+@dataclass(frozen=True)
+class Scanner:
+    """One validator's part in a directory scan."""
+    name: str                           # validator script name, e.g. "dgts-validator"
+    extensions: Tuple[str, ...]         # file name suffixes it checks
+    patterns: Tuple[str, ...]           # every regex it can report (ripgrep prefilter)
+    ignore_case: bool
+    scan: Callable[[Path, Union[str, bytes]], list]   # (file, read_source() content) -> violations
+
+
+def load_validator(name: str) -> ModuleType:
+    """Import a sibling validator script, e.g. "zero-tolerance-validator".
+
+    The scripts have hyphenated file names and can't be imported by name. The
+    module is registered in sys.modules so its functions can be pickled to
+    pool workers.
+    """
+    module_name = name.replace("-", "_")
+    module = sys.modules.get(module_name)
+    if module is None:
+        spec = importlib.util.spec_from_file_location(module_name, Path(__file__).with_name(f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def _load_validators(names: Tuple[str, ...]) -> None:
+    """Pool initializer: make non-__main__ validators importable in workers."""
+    for name in names:
+        load_validator(name)
+
+
+def get_pool(preload: Tuple[str, ...] = ()) -> ProcessPoolExecutor:
+    """Return the shared worker pool, creating it on first use.
+
+    Patterns are compiled at import time, so each worker pays for that once
+    (inherited on fork, re-imported on spawn) rather than once per file.
+    """
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(initializer=_load_validators, initargs=(preload,))
+    return _POOL
+
+
+def iter_source_files(root: Path, extensions: Tuple[str, ...]) -> Iterator[Path]:
+    """Yield files under `root` ending in one of `extensions`.
+
+    Skipped directories are pruned before descending, so nothing under
+    node_modules/.git/etc. is ever listed. Entry types come from the directory
+    listing itself; generated files and files over MAX_FILE_SIZE are skipped.
+    """
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS:
+                        yield from iter_source_files(entry.path, extensions)
+                elif (
+                    entry.name.endswith(extensions)
+                    and not entry.name.endswith(GENERATED_SUFFIXES)
+                    and entry.is_file()
+                    and entry.stat().st_size <= MAX_FILE_SIZE
+                ):
+                    yield Path(entry.path)
+    except OSError as e:
+        print(f"Warning: Could not list {root}: {e}", file=sys.stderr)
+
+
+def read_source(filepath: Path) -> Optional[Union[str, bytes]]:
+    """Read a source file, or return None if it looks binary.
+
+    Pure ASCII files (most source files) come back as bytes and are searched
+    without decoding; scanners decode only the lines they report. Anything
+    else is decoded to str, since bytes regexes don't share str semantics
+    for non-ASCII text.
+    """
+    raw = filepath.read_bytes()
+
+    # A NUL byte near the start means a binary file with a source extension
+    if b"\x00" in raw[:4096]:
+        return None
+
+    # Line endings are normalised the way read_text() would (universal
+    # newlines), without the extra text-mode I/O layer
+    if raw.isascii():
+        if b"\r" in raw:
+            raw = raw.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return raw
+
+    content = raw.decode("utf-8", errors="ignore")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def expand_whitespace(pattern: str) -> str:
+    """Widen every \\s in a str regex to also cover \\x1c-\\x1f.
+
+    Python's str \\s matches those separators; bytes regexes and ripgrep do
+    not, so patterns handed to either go through this first.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    in_class = False
+    while i < n:
+        c = pattern[i]
+        if c == "\\":
+            escape = pattern[i:i + 2]
+            if escape == "\\s":
+                escape = r"\s\x1c-\x1f" if in_class else r"[\s\x1c-\x1f]"
+            out.append(escape)
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def bytes_pattern(pattern: str) -> bytes:
+    """Translate a str regex into the bytes regex that matches the same ASCII text.
+
+    The only difference on ASCII input is the \\s set (see expand_whitespace()).
+    """
+    return expand_whitespace(pattern).encode("ascii")
+
+
+def iter_candidate_lines(regex: re.Pattern, content: AnyStr) -> Iterator[Tuple[int, str]]:
+    """Yield (line number, line) for each line where `regex` finds a match.
+
+    The search runs over the whole buffer and resumes at the start of the next
+    line after every hit, so a match that spills across a newline can never
+    hide a match that starts on the following line. `regex` must match every
+    line that the per-line patterns match, so build it from look-around-free
+    patterns (see drop_lookarounds()). `content` may be str or
+    bytes (with a matching `regex`); lines are always yielded as str, and
+    lines holding NUL bytes (binary data past the sniffed header) are skipped.
+    """
+    if isinstance(content, bytes):
+        newline, nul = b"\n", b"\x00"
+    else:
+        newline, nul = "\n", "\x00"
+
+    pos = 0
+    line_num = 1
+    counted = 0
+    while True:
+        match = regex.search(content, pos)
+        if not match:
+            return
+        start = content.rfind(newline, 0, match.start()) + 1
+        end = content.find(newline, match.start())
+        if end == -1:
+            end = len(content)
+        line_num += content.count(newline, counted, start)
+        counted = start
+        line = content[start:end]
+        if nul not in line:
+            yield line_num, line if isinstance(line, str) else line.decode("ascii")
+        pos = end + 1
+
+
+def drop_lookarounds(pattern: str) -> str:
+    """Remove look-ahead/look-behind groups from a regex.
+
+    Dropping them only widens what a pattern matches, which is what a
+    prefilter needs. ripgrep's default engine has no look-around support,
+    and in a whole-file gate a look-around can see past the end of the line
+    (e.g. a negative look-ahead matching text on the next line), making the
+    gate stricter than the per-line check it guards.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    in_class = False
+    while i < n:
+        if not in_class and pattern.startswith(("(?=", "(?!", "(?<=", "(?<!"), i):
+            depth, group_class = 0, False
+            while i < n:
+                c = pattern[i]
+                if c == "\\":
+                    i += 2
+                    continue
+                if group_class:
+                    group_class = c != "]"
+                elif c == "[":
+                    group_class = True
+                elif c == "(":
+                    depth += 1
+                elif c == ")":
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                i += 1
+            continue
+        c = pattern[i]
+        if c == "\\":
+            out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            in_class = c != "]"
+        elif c == "[":
+            in_class = True
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def find_candidate_files(path: Path, scanners: Sequence[Scanner]) -> Optional[Set[Path]]:
+    """Ask ripgrep which files can contain a match for any scanner's patterns.
+
+    ripgrep matches the whole pattern set at once over raw bytes, so the Python
+    scanners only have to open files that hit. A file left out is never
+    scanned, so the prefilter must only ever widen what the scanners match:
+    look-arounds are dropped, \\s gets Python's separators back (see
+    expand_whitespace()), --crlf makes ^/$ honour \\r\\n and lone \\r line
+    endings as universal newlines do, --follow reaches the symlinked files the
+    walker yields, and files with any non-ASCII or NUL byte are always kept.
+    Returns None when ripgrep is not installed or fails, in which case every
+    file is scanned.
+    """
+    rg = shutil.which("rg")
+    if not rg:
+        return None
+
+    cmd = [rg, "--files-with-matches", "--null", "--no-messages", "--no-config",
+           "--no-ignore", "--hidden", "--text", "--crlf", "--follow"]
+    for ext in dict.fromkeys(ext for scanner in scanners for ext in scanner.extensions):
+        cmd += ["--glob", f"*{ext}"]
+    for skip in SKIP_DIRS:
+        cmd += ["--glob", f"!{skip}"]
+    for scanner in scanners:
+        for pattern in scanner.patterns:
+            pattern = expand_whitespace(drop_lookarounds(pattern))
+            # Case-insensitivity is per scanner, so it is set inline
+            cmd += ["--regexp", f"(?i:{pattern})" if scanner.ignore_case else pattern]
+    # ripgrep's Unicode \w/\b/case folding and Python's errors="ignore"
+    # decoding of invalid UTF-8 can disagree on non-ASCII text, so such files
+    # are always scanned. So are files with NUL bytes: only read_source() can
+    # tell whether they are binary, which decides whether they are counted.
+    cmd += ["--regexp", r"(?-u:[\x00\x80-\xFF])"]
+    cmd += ["--", str(path)]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True)
+    except OSError:
+        return None
+
+    # 0 = matches, 1 = no matches, anything else = error (fall back)
+    if result.returncode not in (0, 1):
+        return None
+
+    return {Path(p) for p in result.stdout.decode("utf-8", errors="surrogateescape").split("\0") if p}
+
+
+def _scan_file(filepath: Path, scanners: Sequence[Scanner]) -> Optional[List[list]]:
+    """Read one file and run every scanner that covers its extension.
+
+    Returns None for a binary file, which doesn't count as scanned.
+    """
+    try:
+        content = read_source(filepath)
+        if content is None:
+            return None
+
+        name = filepath.name
+        return [
+            scanner.scan(filepath, content) if name.endswith(scanner.extensions) else []
+            for scanner in scanners
+        ]
+    except Exception as e:
+        print(f"Warning: Could not scan {filepath}: {e}", file=sys.stderr)
+        return [[] for _ in scanners]
+
+
+def walk_and_scan(path: Path, scanners: Sequence[Scanner]) -> List[Tuple[list, int]]:
+    """Scan `path` for all `scanners` in one walk, reading each file once.
+
+    Returns (violations, eligible file count) for each scanner, in order.
+    Binary files (see read_source()) are not eligible.
+    """
+    scanners = tuple(scanners)
+    extensions = tuple(dict.fromkeys(ext for scanner in scanners for ext in scanner.extensions))
+    candidates = find_candidate_files(path, scanners)
+
+    file_counts = [0] * len(scanners)
+
+    def count(filepath: Path) -> None:
+        for i, scanner in enumerate(scanners):
+            if filepath.name.endswith(scanner.extensions):
+                file_counts[i] += 1
+
+    filepaths = []
+    for filepath in iter_source_files(path, extensions):
+        # ripgrep already ruled this file out. Files with NUL bytes are always
+        # candidates, so this one is text and still counts as scanned.
+        if candidates is not None and filepath not in candidates:
+            count(filepath)
+            continue
+
+        filepaths.append(filepath)
+
+    scan = partial(_scan_file, scanners=scanners)
+    if len(filepaths) >= PARALLEL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        # Workers under spawn re-import __main__ but not validators loaded
+        # through load_validator(), so those are loaded by the initializer
+        preload = tuple(scanner.name for scanner in scanners if scanner.scan.__module__ != "__main__")
+        results = get_pool(preload).map(scan, filepaths, chunksize=32)
+    else:
+        results = map(scan, filepaths)
+
+    all_violations = [[] for _ in scanners]
+    for filepath, per_scanner in zip(filepaths, results):
+        if per_scanner is None:
+            continue
+        count(filepath)
+        for violations, found in zip(all_violations, per_scanner):
+            violations.extend(found)
+
+    return list(zip(all_violations, file_counts))
+
+
+def write_json(payload: dict) -> None:
+    """Write `payload` to stdout as JSON indented by two spaces.
+
+    Uses orjson when it is installed: it serialises large violation lists
+    several times faster and produces bytes for stdout directly. Falls back
+    to the json module without it, or for anything orjson rejects (e.g. file
+    names that aren't valid UTF-8).
+    """
+    if orjson is not None and hasattr(sys.stdout, "buffer"):
+        try:
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(data)
+            return
+
+    sys.stdout.write(json.dumps(payload, indent=2) + "\n")
@@ -10,16 +10,19 @@ Detects gaming patterns in code:
 - Feature faking patterns
 
 Usage:
-    python dgts-validator.py [path] [--threshold 0.3]
+    python dgts-validator.py [path] [--threshold 0.3] [--with-zero-tolerance]
 """
 
-import os
+import io
 import sys
 import re
 import argparse
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, NamedTuple, Tuple, Union
+
+from _common import (
+    Scanner, bytes_pattern, drop_lookarounds, iter_candidate_lines, load_validator, walk_and_scan, write_json,
+)
 
 # Gaming patterns to detect
 GAMING_PATTERNS = {
@@ -87,15 +90,83 @@ GAMING_PATTERNS = {
     ],
 }
 
+# One alternation per category, searched over the whole file: it locates the
+# (rare) lines where any of the category's patterns can match, and only those
+# lines are checked pattern by pattern. Every matching pattern is still reported.
+# Look-arounds are left out of the gates; the per-line check applies them.
+CATEGORY_REGEXES = {
+    category: re.compile(
+        "|".join(f"(?:{drop_lookarounds(pattern)})" for pattern, _ in patterns),
+        re.IGNORECASE | re.MULTILINE,
+    )
+    for category, patterns in GAMING_PATTERNS.items()
+}
+
+# The same gates for pure ASCII files, which are searched as bytes
+CATEGORY_BYTES_REGEXES = {
+    category: re.compile(
+        b"|".join(b"(?:" + bytes_pattern(drop_lookarounds(pattern)) + b")" for pattern, _ in patterns),
+        re.IGNORECASE | re.MULTILINE,
+    )
+    for category, patterns in GAMING_PATTERNS.items()
+}
+
+# Each pattern compiled once at import; the per-line check below runs these
+# directly instead of going through re's compile cache on every call.
+# Category and message strings are interned so every Violation shares them.
+COMPILED_PATTERNS = {
+    sys.intern(category): [
+        (re.compile(pattern, re.IGNORECASE), pattern, sys.intern(message)) for pattern, message in patterns
+    ]
+    for category, patterns in GAMING_PATTERNS.items()
+}
+
+# Literals (lowercase) at least one of which occurs in every possible match of
+# the category's patterns. A pure-ASCII file containing none of them cannot
+# match the category, so its regex is not run at all. Non-ASCII files are
+# always scanned: case-insensitive matching also folds ſ, ı, İ and K (Kelvin
+# sign) onto ASCII letters, which lower() doesn't. check_anchors() below fails at
+# import if a pattern is added without one; categories without an entry are
+# always scanned.
+CATEGORY_ANCHORS = {
+    "test_gaming": ("assert", ".skip", "mock", "fake"),
+    "code_gaming": ("validation", "false", "todo", "_error", "except"),
+    "feature_faking": ("def", "none", "notimplementederror", "todo:", "fixme:"),
+    "mock_patterns": ("mock_data", "fake_", "dummy_", "@test.com", "@example.com", "doe", "lorem", "faker"),
+    "security_bypass": ("damage", "security", "auth", "permission", "hooks", "patterns", "validation"),
+}
+
+
+def check_anchors(gaming_patterns: dict, category_anchors: dict) -> None:
+    """Raise ValueError for any pattern that contains none of its category's anchors.
+
+    Such a pattern would silently never fire on files lacking the anchors.
+    """
+    for category, patterns in gaming_patterns.items():
+        anchors = category_anchors.get(category)
+        if anchors is None:
+            continue
+        for pattern, _ in patterns:
+            literal = pattern.replace("\\", "").lower()
+            if not any(anchor in literal for anchor in anchors):
+                raise ValueError(
+                    f"DGTS pattern {pattern!r} contains none of the {category} anchors {anchors}; "
+                    f"add one to CATEGORY_ANCHORS"
+                )
+
+
+check_anchors(GAMING_PATTERNS, CATEGORY_ANCHORS)
+
+CATEGORY_BYTES_ANCHORS = {
+    category: tuple(anchor.encode("ascii") for anchor in anchors)
+    for category, anchors in CATEGORY_ANCHORS.items()
+}
+
 # File patterns to scan
 SCAN_PATTERNS = ["*.py", "*.ts", "*.tsx", "*.js", "*.jsx"]
 
-# Directories to skip
-SKIP_DIRS = ["node_modules", ".git", "__pycache__", "venv", ".venv", "dist", "build"]
 
-
-@dataclass
-class Violation:
+class Violation(NamedTuple):
     file: str
     line: int
     category: str
@@ -104,46 +175,58 @@ class Violation:
     content: str
 
 
-def scan_file(filepath: Path) -> List[Violation]:
-    """Scan a single file for gaming patterns."""
+def scan_content(filepath: Path, content: Union[str, bytes]) -> List[Violation]:
+    """Scan the content of a single file (see read_source()) for gaming patterns."""
     violations = []
+    file = str(filepath)
 
-    try:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        lines = content.split("\n")
-
-        for line_num, line in enumerate(lines, 1):
-            for category, patterns in GAMING_PATTERNS.items():
-                for pattern, message in patterns:
-                    if re.search(pattern, line, re.IGNORECASE):
-                        violations.append(Violation(
-                            file=str(filepath),
-                            line=line_num,
-                            category=category,
-                            pattern=pattern,
-                            message=message,
-                            content=line.strip()[:80]
-                        ))
-    except Exception as e:
-        print(f"Warning: Could not scan {filepath}: {e}", file=sys.stderr)
-
+    if isinstance(content, bytes):
+        category_regexes, category_anchors = CATEGORY_BYTES_REGEXES, CATEGORY_BYTES_ANCHORS
+        lowered = content.lower()
+    else:
+        # No anchor skip for non-ASCII text (see CATEGORY_ANCHORS)
+        category_regexes, category_anchors, lowered = CATEGORY_REGEXES, {}, content
+
+    for category, patterns in COMPILED_PATTERNS.items():
+        anchors = category_anchors.get(category)
+        if anchors is not None and not any(anchor in lowered for anchor in anchors):
+            continue
+
+        for line_num, line in iter_candidate_lines(category_regexes[category], content):
+            for regex, pattern, message in patterns:
+                if regex.search(line):
+                    violations.append(Violation(
+                        file=file,
+                        line=line_num,
+                        category=category,
+                        pattern=pattern,
+                        message=message,
+                        content=line.strip()[:80]
+                    ))
+
+    # Categories are scanned one after another; a stable sort restores
+    # line order while keeping category/pattern order within a line.
+    violations.sort(key=lambda v: v.line)
     return violations
 
 
-def scan_directory(path: Path, patterns: List[str]) -> List[Violation]:
-    """Recursively scan directory for gaming patterns."""
-    all_violations = []
+SCANNER = Scanner(
+    name="dgts-validator",
+    extensions=tuple(pattern.lstrip("*") for pattern in SCAN_PATTERNS),
+    patterns=tuple(pattern for plist in GAMING_PATTERNS.values() for pattern, _ in plist),
+    ignore_case=True,
+    scan=scan_content,
+)
 
-    for pattern in patterns:
-        for filepath in path.rglob(pattern):
-            # Skip excluded directories
-            if any(skip in filepath.parts for skip in SKIP_DIRS):
-                continue
 
-            violations = scan_file(filepath)
-            all_violations.extend(violations)
+def scan_directory(path: Path) -> Tuple[List[Violation], int]:
+    """Recursively scan directory for gaming patterns.
 
-    return all_violations
+    Returns the violations and the number of files eligible for scanning,
+    counted during the same walk.
+    """
+    [(violations, total_files)] = walk_and_scan(path, [SCANNER])
+    return violations, total_files
 
 
 def calculate_gaming_score(violations: List[Violation], total_files: int) -> float:
@@ -168,16 +251,24 @@ def calculate_gaming_score(violations: List[Violation], total_files: int) -> flo
 
 
 def print_report(violations: List[Violation], score: float, threshold: float):
-    """Print formatted violation report."""
-    print("\n" + "=" * 60)
-    print("  DGTS VALIDATION REPORT")
-    print("  Don't Game The System")
-    print("=" * 60)
+    """Print formatted violation report.
+
+    The report is built in memory and written in one go; every print() to a
+    Windows console is a separate, slow console write.
+    """
+    out = io.StringIO()
+    w = out.write
+
+    w("\n" + "=" * 60 + "\n")
+    w("  DGTS VALIDATION REPORT\n")
+    w("  Don't Game The System\n")
+    w("=" * 60 + "\n")
 
     if not violations:
-        print("\n✅ CLEAN - No gaming patterns detected")
-        print(f"   Gaming Score: {score:.2f}")
-        print("=" * 60)
+        w("\n✅ CLEAN - No gaming patterns detected\n")
+        w(f"   Gaming Score: {score:.2f}\n")
+        w("=" * 60 + "\n")
+        sys.stdout.write(out.getvalue())
         return
 
     # Group by category
@@ -186,29 +277,47 @@ def print_report(violations: List[Violation], score: float, threshold: float):
         by_category.setdefault(v.category, []).append(v)
 
     for category, items in sorted(by_category.items()):
-        print(f"\n🔴 {category.upper().replace('_', ' ')} ({len(items)} violations)")
-        print("-" * 40)
+        w(f"\n🔴 {category.upper().replace('_', ' ')} ({len(items)} violations)\n")
+        w("-" * 40 + "\n")
         for v in items[:5]:  # Show first 5 per category
-            print(f"  {v.file}:{v.line}")
-            print(f"    {v.message}")
-            print(f"    → {v.content}")
+            w(f"  {v.file}:{v.line}\n    {v.message}\n    → {v.content}\n")
         if len(items) > 5:
-            print(f"  ... and {len(items) - 5} more")
+            w(f"  ... and {len(items) - 5} more\n")
 
-    print("\n" + "=" * 60)
-    print(f"  GAMING SCORE: {score:.2f}")
-    print(f"  THRESHOLD:    {threshold:.2f}")
+    w("\n" + "=" * 60 + "\n")
+    w(f"  GAMING SCORE: {score:.2f}\n")
+    w(f"  THRESHOLD:    {threshold:.2f}\n")
 
     if score > threshold:
-        print("\n  ❌ BLOCKED - Gaming score exceeds threshold")
-        print("     Fix violations before proceeding")
+        w("\n  ❌ BLOCKED - Gaming score exceeds threshold\n")
+        w("     Fix violations before proceeding\n")
     elif score > threshold * 0.7:
-        print("\n  ⚠️  WARNING - Approaching threshold")
-        print("     Review flagged patterns")
+        w("\n  ⚠️  WARNING - Approaching threshold\n")
+        w("     Review flagged patterns\n")
     else:
-        print("\n  ✅ PASSED - Within acceptable limits")
-
-    print("=" * 60)
+        w("\n  ✅ PASSED - Within acceptable limits\n")
+
+    w("=" * 60 + "\n")
+    sys.stdout.write(out.getvalue())
+
+
+def build_json(violations: List[Violation], score: float, threshold: float) -> dict:
+    """Build the --json output."""
+    return {
+        "score": score,
+        "threshold": threshold,
+        "passed": score <= threshold,
+        "total_violations": len(violations),
+        "violations": [
+            {
+                "file": v.file,
+                "line": v.line,
+                "category": v.category,
+                "message": v.message
+            }
+            for v in violations
+        ]
+    }
 
 
 def main():
@@ -217,6 +326,8 @@ def main():
     parser.add_argument("--threshold", type=float, default=0.3, help="Gaming score threshold")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--quiet", action="store_true", help="Only output score")
+    parser.add_argument("--with-zero-tolerance", action="store_true",
+                        help="Also run the zero tolerance validator in the same pass")
 
     args = parser.parse_args()
 
@@ -226,43 +337,40 @@ def main():
         print(f"Error: Path does not exist: {path}", file=sys.stderr)
         sys.exit(1)
 
-    # Count total files
-    total_files = sum(
-        1 for pattern in SCAN_PATTERNS
-        for _ in path.rglob(pattern)
-        if not any(skip in _.parts for skip in SKIP_DIRS)
-    )
+    scanners = [SCANNER]
+    if args.with_zero_tolerance:
+        zero_tolerance = load_validator("zero-tolerance-validator")
+        scanners.append(zero_tolerance.SCANNER)
 
-    # Scan for violations
-    violations = scan_directory(path, SCAN_PATTERNS)
+    # Scan for violations (one walk and one read per file for both reports;
+    # counts eligible files in the same walk)
+    results = walk_and_scan(path, scanners)
+    violations, total_files = results[0]
 
     # Calculate score
     score = calculate_gaming_score(violations, total_files)
+    passed = score <= args.threshold
+
+    if args.with_zero_tolerance:
+        zt_violations, _ = results[1]
+        passed = passed and not zt_violations
 
     if args.quiet:
         print(f"{score:.2f}")
+        if args.with_zero_tolerance:
+            print("PASS" if not zt_violations else "FAIL")
     elif args.json:
-        import json
-        print(json.dumps({
-            "score": score,
-            "threshold": args.threshold,
-            "passed": score <= args.threshold,
-            "total_violations": len(violations),
-            "violations": [
-                {
-                    "file": v.file,
-                    "line": v.line,
-                    "category": v.category,
-                    "message": v.message
-                }
-                for v in violations
-            ]
-        }, indent=2))
+        output = build_json(violations, score, args.threshold)
+        if args.with_zero_tolerance:
+            output = {"dgts": output, "zero_tolerance": zero_tolerance.build_json(zt_violations)}
+        write_json(output)
     else:
         print_report(violations, score, args.threshold)
+        if args.with_zero_tolerance:
+            zero_tolerance.print_report(zt_violations)
 
-    # Exit with error if over threshold
-    sys.exit(0 if score <= args.threshold else 1)
+    # Exit with error if over threshold (or zero tolerance violations found)
+    sys.exit(0 if passed else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Tests for the DGTS and zero tolerance validators
+Part of PAI (Personal AI Infrastructure)
+
+Run with: python -m pytest scripts/validators
+"""
+
+import io
+import re
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# The validators are scripts, not a package
+sys.path.insert(0, str(Path(__file__).parent))
+
+import _common
+from _common import bytes_pattern, drop_lookarounds, find_candidate_files, load_validator, walk_and_scan
+
+dgts = load_validator("dgts-validator")
+zero_tolerance = load_validator("zero-tolerance-validator")
+SCANNERS = (dgts.SCANNER, zero_tolerance.SCANNER)
+
+requires_rg = pytest.mark.skipif(shutil.which("rg") is None, reason="ripgrep not installed")
+
+# Files that exercise the differences between the fast paths (whole-file
+# gates, bytes regexes, ripgrep) and a plain per-line re.search()
+CORPUS = {
+    "crlf.py": b"try:\r\n    x = 1\r\nexcept:\r\n    pass\r\nassert True\r\n",
+    "lone_cr.py": b"x = 1\rprint('a')\rassert True\rexcept:\r",
+    "separator.py": b"try:\n    x = 1\nexcept :  \x1c\n    pass\nassert\x1fTrue\n",
+    "lookahead.py": b'import os\nprint("starting")  #\ndebug = os.environ.get("X")\n',
+    "unicode.py": "# café\nfake_\u00b2 = 1\nassert\u00a0True\nJOHN = 'John Doe'\n".encode(),
+    "case_fold.py": "# \u017fecurity_check disabled\nx = 1  # val\u0131dation\nMOC\u212a_DATA = 1\n".encode(),
+    "invalid_utf8.py": b"assert \xff True\nexcept\xfe: pass\n",
+    "many.py": b"except: pass  # validation\n    pass  # TODO: implement\ndef f(): pass\n",
+    "app.ts": b"try { x() } catch {}\nconsole.log(x as any) // @ts-ignore\nconst y: any = 1\n",
+    "app.js": b"catch (e) {}\r\nconsole.warn('x')\rit.skip('security check')\n",
+    "late_nul.py": b"#" * 5000 + b"\nassert True\x00\nassert True\n",
+    "binary.js": b"\x00console.log(1)\n",
+    "long.py": b"x = 1; " * 20 + b"assert True\nmock_data = fake_rows = dummy_x = 1  # FIXME: lorem ipsum\n",
+}
+
+# Every shipped pattern, with the flags its validator uses
+ALL_PATTERNS = [
+    (pattern, re.IGNORECASE) for patterns in dgts.GAMING_PATTERNS.values() for pattern, _ in patterns
+] + [
+    (pattern, 0)
+    for categories in zero_tolerance.ZERO_TOLERANCE_PATTERNS.values()
+    for pattern_list in categories.values()
+    for pattern, _ in pattern_list
+]
+
+# Lines that between them hit every shipped pattern, plus near misses
+SAMPLE_LINES = [
+    "assert True", "assert 1 == 1", "assert 'a' == 'b'", "@pytest.mark.skip", "@unittest.skip",
+    "return 'mock'", "return {'fake': 1}",
+    "# validation", "if False:", "pass # TODO", "void _error", "except: pass", "except Exception: ...",
+    "def f(x): pass", "return None # stub", "raise NotImplementedError", "TODO: implement", "FIXME: later",
+    "mock_data = 1", "fake_user = 1", "dummy_x = 1", "test@test.com", "example@example.com",
+    "'John Doe'", "'Jane Doe'", "lorem ipsum", "from faker import Faker",
+    "// damage_control", "# security-check", "/* auth_check", "hooks: []", "hooks = []",
+    "DAMAGE_CONTROL_ENABLED = false", "DAMAGE_CONTROL_ENABLED: False",
+    "SKIP_SECURITY_CHECKS = true", "SKIP_SECURITY_CHECKS = True", "bashToolPatterns: []", "patterns: []",
+    "if (false) { security()", "if False: auth()", "return true; // skip security",
+    "return True # bypass validation", "@pytest.mark.skip(reason='security')", "@unittest.skip('security')",
+    "it.skip('security')", "test.skip('security')",
+    "console.log(x)", "catch {", "catch (_e)", "catch (e) {}", "void error", "x: any", "x as any",
+    "// @ts-ignore", "// @ts-nocheck",
+    "except:", "print(x)", "breakpoint()", "pdb.set_trace()", "import pdb", "# type: ignore", "List[Any]",
+    "print(x)  # debug", "print(x)  #", "assert True  # x", "x: anything", "company = 1", "",
+]
+# The same lines with Python-only whitespace (\x1c-\x1f) in place of spaces
+SAMPLE_LINES += [line.replace(" ", sep) for line in SAMPLE_LINES if " " in line for sep in ("\x1c", "\x1f")]
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for name, content in CORPUS.items():
+        (tmp_path / name).write_bytes(content)
+    return tmp_path
+
+
+@pytest.fixture
+def linked_corpus(corpus, tmp_path_factory):
+    """The corpus plus a symlinked source file, which the walker follows."""
+    real = tmp_path_factory.mktemp("real") / "bad.py"
+    real.write_bytes(b"except: pass\nfake_x = 1\n")
+    (corpus / "link.py").symlink_to(real)
+    return corpus
+
+
+@pytest.fixture
+def no_rg(monkeypatch):
+    """Scan every file in Python, without the ripgrep prefilter."""
+    monkeypatch.setattr(_common, "find_candidate_files", lambda path, scanners: None)
+
+
+def found(violations):
+    """(file name, line, category) for each violation, in report order."""
+    return [(Path(v.file).name, v.line, v.category) for v in violations]
+
+
+def test_gate_lookahead_does_not_read_next_line(tmp_path):
+    """A negative look-ahead must not see past the end of its line.
+
+    `(?!.*#\\s*debug)` would match `#` + newline + `debug` across two lines;
+    the print on line 2 is still a violation. Checked for both the bytes
+    (ASCII) and the str (non-ASCII) scan paths.
+    """
+    source = 'import os\nprint("starting")  #\ndebug = os.environ.get("X")\n'
+    (tmp_path / "ascii.py").write_text(source, encoding="utf-8")
+    (tmp_path / "text.py").write_text("# é\n" + source, encoding="utf-8")
+
+    violations = zero_tolerance.scan_directory(tmp_path)
+
+    assert sorted(found(violations)) == [
+        ("ascii.py", 2, "debug_statements"),
+        ("text.py", 3, "debug_statements"),
+    ]
+
+
+@requires_rg
+def test_ripgrep_prefilter_only_widens(linked_corpus, no_rg):
+    """Every file the Python scan flags must be a ripgrep candidate."""
+    candidates = find_candidate_files(linked_corpus, SCANNERS)
+
+    flagged = set()
+    for violations, _ in walk_and_scan(linked_corpus, SCANNERS):
+        flagged |= {Path(v.file) for v in violations}
+    assert linked_corpus / "link.py" in flagged
+    assert flagged <= candidates
+
+
+@requires_rg
+def test_ripgrep_keeps_separator_whitespace(tmp_path):
+    """Python's \\s matches \\x1c-\\x1f; ripgrep's does not unless widened."""
+    (tmp_path / "bare.py").write_bytes(b"except :  \x1c\n")
+
+    violations = zero_tolerance.scan_directory(tmp_path)
+
+    assert found(violations) == [("bare.py", 1, "error_handling")]
+
+
+def test_check_anchors_rejects_unanchored_pattern():
+    """A pattern without any of its category's anchors fails loudly."""
+    patterns = {"test_gaming": [(r"assert\s+True", "ok"), (r"expect\(true\)", "no anchor")]}
+
+    dgts.check_anchors({"test_gaming": patterns["test_gaming"][:1]}, dgts.CATEGORY_ANCHORS)
+    with pytest.raises(ValueError, match="expect"):
+        dgts.check_anchors(patterns, dgts.CATEGORY_ANCHORS)
+
+
+@pytest.mark.parametrize("use_rg", [
+    False,
+    pytest.param(True, marks=requires_rg),
+])
+def test_binary_files_are_not_counted(corpus, monkeypatch, use_rg):
+    """Files rejected as binary don't count toward the DGTS score denominator."""
+    if not use_rg:
+        monkeypatch.setattr(_common, "find_candidate_files", lambda path, scanners: None)
+
+    (_, dgts_files), (_, zt_files) = walk_and_scan(corpus, SCANNERS)
+
+    text_files = len(CORPUS) - 1  # binary.js
+    assert dgts_files == zt_files == text_files
+
+
+def naive_scan(filepath):
+    """Reference result: universal-newline decode and re.search() per line.
+
+    Mirrors the original read_text() + split("\\n") validators, plus the
+    binary-file and NUL-line skips.
+    """
+    raw = filepath.read_bytes()
+    if b"\x00" in raw[:4096]:
+        return {}
+
+    text = io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8", errors="ignore", newline=None).read()
+    lang = zero_tolerance.get_language(filepath)
+    checks = {
+        "dgts": [
+            (category, pattern, message, re.IGNORECASE)
+            for category, patterns in dgts.GAMING_PATTERNS.items()
+            for pattern, message in patterns
+        ],
+        "zero_tolerance": [
+            (category, pattern, message, 0)
+            for category, pattern_list in zero_tolerance.ZERO_TOLERANCE_PATTERNS.get(lang, {}).items()
+            for pattern, message in pattern_list
+        ],
+    }
+
+    results = {}
+    for validator, validator_checks in checks.items():
+        results[validator] = [
+            (line_num, category, message, line.strip()[:80])
+            for line_num, line in enumerate(text.split("\n"), 1)
+            if "\x00" not in line
+            for category, pattern, message, flags in validator_checks
+            if re.search(pattern, line, flags)
+        ]
+    return results
+
+
+@pytest.mark.parametrize("use_rg", [
+    False,
+    pytest.param(True, marks=requires_rg),
+])
+def test_scan_matches_naive_per_line_search(corpus, monkeypatch, use_rg):
+    """The fused scan reports exactly what a per-line re.search() finds."""
+    if not use_rg:
+        monkeypatch.setattr(_common, "find_candidate_files", lambda path, scanners: None)
+
+    (dgts_violations, _), (zt_violations, _) = walk_and_scan(corpus, SCANNERS)
+
+    for name in CORPUS:
+        expected = naive_scan(corpus / name)
+        got = {
+            "dgts": [
+                (v.line, v.category, v.message, v.content) for v in dgts_violations if Path(v.file).name == name
+            ],
+            "zero_tolerance": [
+                (v.line, v.category, v.message, v.content) for v in zt_violations if Path(v.file).name == name
+            ],
+        }
+        assert got == (expected or {"dgts": [], "zero_tolerance": []}), name
+
+
+def test_samples_cover_every_pattern():
+    """Keeps SAMPLE_LINES honest: each shipped pattern matches at least one."""
+    for pattern, flags in ALL_PATTERNS:
+        assert any(re.search(pattern, line, flags) for line in SAMPLE_LINES), pattern
+
+
+@pytest.mark.parametrize("pattern, flags", ALL_PATTERNS)
+def test_bytes_pattern_matches_like_str_pattern(pattern, flags):
+    """On ASCII text the bytes translation matches exactly what the str pattern does."""
+    compiled = re.compile(pattern, flags)
+    compiled_bytes = re.compile(bytes_pattern(pattern), flags)
+
+    for line in SAMPLE_LINES:
+        assert bool(compiled.search(line)) == bool(compiled_bytes.search(line.encode("ascii"))), line
+
+
+@pytest.mark.parametrize("pattern, flags", ALL_PATTERNS)
+def test_drop_lookarounds_only_widens(pattern, flags):
+    """Without look-arounds a pattern matches at least everything it did."""
+    dropped = drop_lookarounds(pattern)
+
+    assert not any(marker in dropped for marker in ("(?=", "(?!", "(?<=", "(?<!"))
+    if not any(marker in pattern for marker in ("(?=", "(?!", "(?<=", "(?<!")):
+        assert dropped == pattern
+
+    compiled, compiled_dropped = re.compile(pattern, flags), re.compile(dropped, flags)
+    for line in SAMPLE_LINES + [line.decode("utf-8", errors="ignore") for line in CORPUS.values()]:
+        if compiled.search(line):
+            assert compiled_dropped.search(line), line
@@ -10,16 +10,19 @@ Enforces strict code quality standards:
 - Type safety checks
 
 Usage:
-    python zero-tolerance-validator.py [path]
+    python zero-tolerance-validator.py [path] [--with-dgts]
 """
 
-import os
+import io
 import sys
 import re
 import argparse
 from pathlib import Path
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from _common import (
+    Scanner, bytes_pattern, drop_lookarounds, iter_candidate_lines, load_validator, walk_and_scan, write_json,
+)
 
 # Zero tolerance patterns by language
 ZERO_TOLERANCE_PATTERNS = {
@@ -68,6 +71,46 @@ ZERO_TOLERANCE_PATTERNS = {
     },
 }
 
+# All of a language's patterns in one alternation, searched once over the
+# whole file to find the lines worth checking pattern by pattern. Look-arounds
+# are left out (see drop_lookarounds()); the per-line check applies them.
+LANGUAGE_REGEXES = {
+    lang: re.compile(
+        "|".join(
+            f"(?:{drop_lookarounds(pattern)})"
+            for pattern_list in categories.values()
+            for pattern, _ in pattern_list
+        ),
+        re.MULTILINE,
+    )
+    for lang, categories in ZERO_TOLERANCE_PATTERNS.items()
+}
+
+# The same gates for pure ASCII files, which are searched as bytes
+LANGUAGE_BYTES_REGEXES = {
+    lang: re.compile(
+        b"|".join(
+            b"(?:" + bytes_pattern(drop_lookarounds(pattern)) + b")"
+            for pattern_list in categories.values()
+            for pattern, _ in pattern_list
+        ),
+        re.MULTILINE,
+    )
+    for lang, categories in ZERO_TOLERANCE_PATTERNS.items()
+}
+
+# Each language's patterns compiled once at import and flattened, in category
+# order, for the per-line check; category and message strings are interned so
+# every Violation shares them.
+COMPILED_PATTERNS = {
+    lang: [
+        (re.compile(pattern), sys.intern(category), sys.intern(message))
+        for category, pattern_list in categories.items()
+        for pattern, message in pattern_list
+    ]
+    for lang, categories in ZERO_TOLERANCE_PATTERNS.items()
+}
+
 # File extensions to language mapping
 EXT_TO_LANG = {
     ".ts": "typescript",
@@ -77,12 +120,8 @@ EXT_TO_LANG = {
     ".py": "python",
 }
 
-# Directories to skip
-SKIP_DIRS = ["node_modules", ".git", "__pycache__", "venv", ".venv", "dist", "build", ".next"]
-
 
-@dataclass
-class Violation:
+class Violation(NamedTuple):
     file: str
     line: int
     category: str
@@ -96,63 +135,71 @@ def get_language(filepath: Path) -> Optional[str]:
     return EXT_TO_LANG.get(filepath.suffix.lower())
 
 
-def scan_file(filepath: Path) -> List[Violation]:
-    """Scan a single file for zero tolerance violations."""
+def scan_content(filepath: Path, content: Union[str, bytes]) -> List[Violation]:
+    """Scan the content of a single file (see read_source()) for zero tolerance violations."""
     violations = []
+    file = str(filepath)
     lang = get_language(filepath)
 
     if not lang:
         return violations
 
-    patterns = ZERO_TOLERANCE_PATTERNS.get(lang, {})
-
-    try:
-        content = filepath.read_text(encoding="utf-8", errors="ignore")
-        lines = content.split("\n")
-
-        for line_num, line in enumerate(lines, 1):
-            for category, pattern_list in patterns.items():
-                for pattern, message in pattern_list:
-                    if re.search(pattern, line):
-                        violations.append(Violation(
-                            file=str(filepath),
-                            line=line_num,
-                            category=category,
-                            message=message,
-                            content=line.strip()[:80]
-                        ))
-    except Exception as e:
-        print(f"Warning: Could not scan {filepath}: {e}", file=sys.stderr)
+    patterns = COMPILED_PATTERNS[lang]
+    if isinstance(content, bytes):
+        language_regex = LANGUAGE_BYTES_REGEXES[lang]
+    else:
+        language_regex = LANGUAGE_REGEXES[lang]
+
+    # One pass over the file; lines come in order, and within a line
+    # violations follow category/pattern order
+    for line_num, line in iter_candidate_lines(language_regex, content):
+        for regex, category, message in patterns:
+            if regex.search(line):
+                violations.append(Violation(
+                    file=file,
+                    line=line_num,
+                    category=category,
+                    message=message,
+                    content=line.strip()[:80]
+                ))
 
     return violations
 
 
-def scan_directory(path: Path) -> List[Violation]:
-    """Recursively scan directory for violations."""
-    all_violations = []
-
-    for ext in EXT_TO_LANG.keys():
-        for filepath in path.rglob(f"*{ext}"):
-            # Skip excluded directories
-            if any(skip in filepath.parts for skip in SKIP_DIRS):
-                continue
+SCANNER = Scanner(
+    name="zero-tolerance-validator",
+    extensions=tuple(EXT_TO_LANG),
+    patterns=tuple(
+        pattern
+        for categories in ZERO_TOLERANCE_PATTERNS.values()
+        for pattern_list in categories.values()
+        for pattern, _ in pattern_list
+    ),
+    ignore_case=False,
+    scan=scan_content,
+)
 
-            violations = scan_file(filepath)
-            all_violations.extend(violations)
 
-    return all_violations
+def scan_directory(path: Path) -> List[Violation]:
+    """Recursively scan directory for violations."""
+    [(violations, _)] = walk_and_scan(path, [SCANNER])
+    return violations
 
 
 def print_report(violations: List[Violation]):
-    """Print formatted violation report."""
-    print("\n" + "=" * 60)
-    print("  ZERO TOLERANCE QUALITY REPORT")
-    print("  PAI Code Quality Enforcement")
-    print("=" * 60)
+    """Print formatted violation report (built in memory, written once)."""
+    out = io.StringIO()
+    w = out.write
+
+    w("\n" + "=" * 60 + "\n")
+    w("  ZERO TOLERANCE QUALITY REPORT\n")
+    w("  PAI Code Quality Enforcement\n")
+    w("=" * 60 + "\n")
 
     if not violations:
-        print("\n✅ CLEAN - No zero tolerance violations")
-        print("=" * 60)
+        w("\n✅ CLEAN - No zero tolerance violations\n")
+        w("=" * 60 + "\n")
+        sys.stdout.write(out.getvalue())
         return True
 
     # Group by category
@@ -161,29 +208,50 @@ def print_report(violations: List[Violation]):
         by_category.setdefault(v.category, []).append(v)
 
     for category, items in sorted(by_category.items()):
-        print(f"\n🔴 {category.upper().replace('_', ' ')} ({len(items)} violations)")
-        print("-" * 40)
+        w(f"\n🔴 {category.upper().replace('_', ' ')} ({len(items)} violations)\n")
+        w("-" * 40 + "\n")
         for v in items[:10]:  # Show first 10 per category
-            print(f"  {v.file}:{v.line}")
-            print(f"    [{v.severity}] {v.message}")
-            print(f"    → {v.content}")
+            w(f"  {v.file}:{v.line}\n    [{v.severity}] {v.message}\n    → {v.content}\n")
         if len(items) > 10:
-            print(f"  ... and {len(items) - 10} more")
+            w(f"  ... and {len(items) - 10} more\n")
 
-    print("\n" + "=" * 60)
-    print(f"  TOTAL VIOLATIONS: {len(violations)}")
-    print("\n  ❌ BLOCKED - Zero tolerance violations found")
-    print("     All violations must be fixed before proceeding")
-    print("=" * 60)
+    w("\n" + "=" * 60 + "\n")
+    w(f"  TOTAL VIOLATIONS: {len(violations)}\n")
+    w("\n  ❌ BLOCKED - Zero tolerance violations found\n")
+    w("     All violations must be fixed before proceeding\n")
+    w("=" * 60 + "\n")
+    sys.stdout.write(out.getvalue())
 
     return False
 
 
+def build_json(violations: List[Violation]) -> dict:
+    """Build the --json output."""
+    return {
+        "passed": len(violations) == 0,
+        "total_violations": len(violations),
+        "violations": [
+            {
+                "file": v.file,
+                "line": v.line,
+                "category": v.category,
+                "message": v.message,
+                "severity": v.severity
+            }
+            for v in violations
+        ]
+    }
+
+
 def main():
     parser = argparse.ArgumentParser(description="Zero Tolerance Quality Validator")
     parser.add_argument("path", nargs="?", default=".", help="Path to scan")
     parser.add_argument("--json", action="store_true", help="Output as JSON")
     parser.add_argument("--quiet", action="store_true", help="Only output pass/fail")
+    parser.add_argument("--with-dgts", action="store_true",
+                        help="Also run the DGTS validator in the same pass")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="DGTS gaming score threshold (with --with-dgts)")
 
     args = parser.parse_args()
 
@@ -193,32 +261,37 @@ def main():
         print(f"Error: Path does not exist: {path}", file=sys.stderr)
         sys.exit(1)
 
-    # Scan for violations
-    violations = scan_directory(path)
+    scanners = [SCANNER]
+    if args.with_dgts:
+        dgts = load_validator("dgts-validator")
+        scanners.append(dgts.SCANNER)
+
+    # Scan for violations (one walk and one read per file for both reports)
+    results = walk_and_scan(path, scanners)
+    violations, _ = results[0]
+    passed = not violations
+
+    if args.with_dgts:
+        dgts_violations, total_files = results[1]
+        score = dgts.calculate_gaming_score(dgts_violations, total_files)
+        passed = passed and score <= args.threshold
 
     if args.quiet:
         print("PASS" if not violations else "FAIL")
+        if args.with_dgts:
+            print(f"{score:.2f}")
     elif args.json:
-        import json
-        print(json.dumps({
-            "passed": len(violations) == 0,
-            "total_violations": len(violations),
-            "violations": [
-                {
-                    "file": v.file,
-                    "line": v.line,
-                    "category": v.category,
-                    "message": v.message,
-                    "severity": v.severity
-                }
-                for v in violations
-            ]
-        }, indent=2))
+        output = build_json(violations)
+        if args.with_dgts:
+            output = {"dgts": dgts.build_json(dgts_violations, score, args.threshold), "zero_tolerance": output}
+        write_json(output)
     else:
-        passed = print_report(violations)
+        print_report(violations)
+        if args.with_dgts:
+            dgts.print_report(dgts_violations, score, args.threshold)
 
-    # Exit with error if violations found
-    sys.exit(0 if not violations else 1)
+    # Exit with error if violations found (or DGTS score over threshold)
+    sys.exit(0 if passed else 1)
 
 
 if __name__ == "__main__":